@@ -7,21 +7,49 @@ Crypto Portfolio Tracker
 
 import json
 import csv
-from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+import time
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from dataclasses import dataclass
 
+import numpy as np
 
-@dataclass
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时使用标准库 json
+    orjson = None
+
+
+# 示例行情 (实际使用时应接入真实API)
+MOCK_PRICES = {
+    'BTC': 84750.50, 'ETH': 2850.75, 'SOL': 145.30,
+    'ADA': 0.85, 'DOT': 7.50, 'AVAX': 35.20,
+    'MATIC': 0.65, 'LINK': 18.50, 'UNI': 9.80
+}
+
+
+# (今日日期字符串, 次日零点的时间戳)
+_today_cache: Tuple[str, float] = ('', 0.0)
+
+
+def _today() -> str:
+    """返回今日日期 'YYYY-MM-DD'，日期未翻转前复用缓存，避免重复 strftime"""
+    global _today_cache
+    if time.time() >= _today_cache[1]:
+        now = datetime.now()
+        midnight = datetime(now.year, now.month, now.day) + timedelta(days=1)
+        _today_cache = (now.strftime('%Y-%m-%d'), midnight.timestamp())
+    return _today_cache[0]
+
+
+@dataclass(frozen=True)
 class Asset:
-    """单个资产持仓"""
+    """单个资产持仓 (只读快照，symbol 须为大写)"""
     symbol: str
     name: str
     quantity: float
     avg_buy_price: float
-    
-    def __post_init__(self):
-        self.symbol = self.symbol.upper()
 
 
 class CryptoPortfolioTracker:
@@ -34,28 +62,127 @@ class CryptoPortfolioTracker:
         summary = tracker.get_portfolio_summary()
     """
     
+    # 持仓数组的初始容量，不足时按倍数扩容
+    _INITIAL_CAPACITY = 16
+    
     def __init__(self):
-        self.assets: Dict[str, Asset] = {}
         self.transactions: List[Dict] = []
+        # 最新行情 {代码: 价格}，由 update_prices 更新
+        self._price_feed: Dict[str, float] = dict(MOCK_PRICES)
+        self._reset_holdings()
+        # 持仓每次变动时递增，用于判断持仓视图与汇总缓存是否失效
+        self._version = 0
+        # 行情每次更新时递增，只影响汇总缓存
+        self._price_version = 0
+        self._summary_cache: Tuple[Optional[Dict], Tuple[int, int]] = (None, (-1, -1))
+        self._assets_cache: Tuple[Optional[Mapping[str, Asset]], int] = (None, -1)
+    
+    def _reset_holdings(self) -> None:
+        """
+        清空持仓
+        
+        持仓按列存储 (Struct of Arrays)：第 i 个持仓的代码、名称、数量和均价
+        分别位于 _symbols[i]、_names[i]、_qty[i]、_avg[i]，_idx 为代码到下标的索引；
+        _price_vec[i] 为对齐的最新价格，_has_price[i] 为假时按均价估值。
+        删除只把 _alive[i] 置假 (墓碑)，读取前由 _compact 统一压缩
+        """
+        self._symbols: List[str] = []
+        self._names: List[str] = []
+        self._idx: Dict[str, int] = {}
+        self._qty = np.zeros(self._INITIAL_CAPACITY)
+        self._avg = np.zeros(self._INITIAL_CAPACITY)
+        self._price_vec = np.zeros(self._INITIAL_CAPACITY)
+        self._has_price = np.zeros(self._INITIAL_CAPACITY, dtype=bool)
+        self._alive = np.zeros(self._INITIAL_CAPACITY, dtype=bool)
+        self._dead = 0
+    
+    def _append_holding(self, symbol: str, name: str, quantity: float,
+                        avg_buy_price: float) -> None:
+        """在数组末尾追加新持仓，容量不足时先压缩墓碑，仍不足再倍增"""
+        i = len(self._symbols)
+        if i == self._qty.shape[0]:
+            self._compact()
+            i = len(self._symbols)
+        if i == self._qty.shape[0]:
+            self._qty = np.resize(self._qty, 2 * i)
+            self._avg = np.resize(self._avg, 2 * i)
+            self._price_vec = np.resize(self._price_vec, 2 * i)
+            self._has_price = np.resize(self._has_price, 2 * i)
+            self._alive = np.resize(self._alive, 2 * i)
+        self._symbols.append(symbol)
+        self._names.append(name)
+        self._idx[symbol] = i
+        self._qty[i] = quantity
+        self._avg[i] = avg_buy_price
+        price = self._price_feed.get(symbol)
+        self._has_price[i] = price is not None
+        self._price_vec[i] = price if price is not None else 0.0
+        self._alive[i] = True
+    
+    def _delete_holding(self, i: int) -> None:
+        """删除第 i 个持仓 (O(1))：仅标记为墓碑，数组留待 _compact 压缩"""
+        del self._idx[self._symbols[i]]
+        self._alive[i] = False
+        self._dead += 1
+    
+    def _compact(self) -> None:
+        """移除墓碑行，剩余持仓保持添加顺序前移，并重建 _idx"""
+        if not self._dead:
+            return
+        n = len(self._symbols)
+        keep = np.flatnonzero(self._alive[:n])
+        k = len(keep)
+        for arr in (self._qty, self._avg, self._price_vec, self._has_price):
+            arr[:k] = arr[keep]
+        self._alive[:k] = True
+        self._alive[k:n] = False
+        keep = keep.tolist()
+        self._symbols = [self._symbols[j] for j in keep]
+        self._names = [self._names[j] for j in keep]
+        self._idx = {symbol: j for j, symbol in enumerate(self._symbols)}
+        self._dead = 0
+    
+    @property
+    def assets(self) -> Mapping[str, Asset]:
+        """
+        当前持仓的只读视图 {代码: Asset}
+        
+        持仓未变动时复用同一视图；修改持仓请使用 add_asset / remove_asset，
+        对视图或 Asset 的写入会抛出异常
+        """
+        cached, version = self._assets_cache
+        if version == self._version:
+            return cached
+        
+        self._compact()
+        assets = MappingProxyType({
+            symbol: Asset(symbol=symbol, name=name, quantity=q, avg_buy_price=a)
+            for symbol, name, q, a in zip(self._symbols, self._names,
+                                          self._qty.tolist(), self._avg.tolist())
+        })
+        self._assets_cache = (assets, self._version)
+        return assets
     
     def add_asset(self, symbol: str, name: str, quantity: float, 
                   buy_price: float, date: str = None) -> None:
         """添加新资产或更新现有资产"""
-        symbol = symbol.upper()
-        date = date or datetime.now().strftime('%Y-%m-%d')
-        
-        if symbol in self.assets:
-            existing = self.assets[symbol]
-            total_qty = existing.quantity + quantity
-            total_cost = (existing.quantity * existing.avg_buy_price + 
+        self._add_asset_unchecked(symbol.upper(), name, quantity, buy_price,
+                                  date or _today())
+    
+    def _add_asset_unchecked(self, symbol: str, name: str, quantity: float,
+                             buy_price: float, date: str) -> None:
+        """add_asset 的内部实现，symbol 须已是大写、date 须已确定"""
+        i = self._idx.get(symbol)
+        if i is not None:
+            existing_qty = float(self._qty[i])
+            total_qty = existing_qty + quantity
+            total_cost = (existing_qty * float(self._avg[i]) + 
                          quantity * buy_price)
-            existing.avg_buy_price = total_cost / total_qty
-            existing.quantity = total_qty
+            self._avg[i] = total_cost / total_qty
+            self._qty[i] = total_qty
         else:
-            self.assets[symbol] = Asset(
-                symbol=symbol, name=name, quantity=quantity, 
-                avg_buy_price=buy_price
-            )
+            self._append_holding(symbol, name, quantity, buy_price)
+        self._version += 1
         
         self.transactions.append({
             'date': date, 'symbol': symbol, 'type': 'BUY',
@@ -63,107 +190,208 @@ class CryptoPortfolioTracker:
             'total': quantity * buy_price
         })
     
+    def add_assets_bulk(self, rows: Iterable[Tuple[str, str, float, float]],
+                        date: str = None) -> None:
+        """
+        批量添加资产 (如导入历史交易)
+        
+        Args:
+            rows: (symbol, name, quantity, buy_price) 序列
+            date: 交易日期，不传则统一使用今日
+        """
+        date = date or _today()
+        for symbol, name, quantity, buy_price in rows:
+            self._add_asset_unchecked(symbol.upper(), name, quantity, buy_price, date)
+    
     def remove_asset(self, symbol: str, quantity: float = None) -> None:
         """移除或减仓资产"""
         symbol = symbol.upper()
         
-        if symbol not in self.assets:
+        i = self._idx.get(symbol)
+        if i is None:
             print(f"错误: 未持有 {symbol}")
             return
         
-        asset = self.assets[symbol]
+        held_qty = float(self._qty[i])
         
-        if quantity is None or quantity >= asset.quantity:
-            removed_qty = asset.quantity
-            del self.assets[symbol]
+        if quantity is None or quantity >= held_qty:
+            removed_qty = held_qty
+            self._delete_holding(i)
         else:
-            asset.quantity -= quantity
+            self._qty[i] = held_qty - quantity
             removed_qty = quantity
+        self._version += 1
         
         self.transactions.append({
-            'date': datetime.now().strftime('%Y-%m-%d'),
+            'date': _today(),
             'symbol': symbol, 'type': 'SELL',
             'quantity': removed_qty, 'price': 0, 'total': 0
         })
     
-    def get_portfolio_summary(self) -> Dict:
-        """获取投资组合汇总"""
-        mock_prices = {
-            'BTC': 84750.50, 'ETH': 2850.75, 'SOL': 145.30,
-            'ADA': 0.85, 'DOT': 7.50, 'AVAX': 35.20,
-            'MATIC': 0.65, 'LINK': 18.50, 'UNI': 9.80
-        }
-        
-        total_invested = 0
-        total_current = 0
-        assets_detail = []
-        
-        for symbol, asset in self.assets.items():
-            current_price = mock_prices.get(symbol, asset.avg_buy_price)
-            invested = asset.quantity * asset.avg_buy_price
-            current = asset.quantity * current_price
-            pnl = current - invested
-            pnl_pct = (pnl / invested * 100) if invested > 0 else 0
-            
-            total_invested += invested
-            total_current += current
-            
-            assets_detail.append({
-                'symbol': symbol, 'name': asset.name,
-                'quantity': asset.quantity,
-                'avg_price': asset.avg_buy_price,
-                'current_price': current_price,
-                'invested': invested, 'current_value': current,
-                'pnl': pnl, 'pnl_pct': pnl_pct
-            })
+    def update_prices(self, prices: Dict[str, float]) -> None:
+        """
+        更新行情
         
+        Args:
+            prices: {代码: 最新价格}，未出现的代码保持原价格
+        """
+        for symbol, price in prices.items():
+            symbol = symbol.upper()
+            self._price_feed[symbol] = price
+            i = self._idx.get(symbol)
+            if i is not None:
+                self._price_vec[i] = price
+                self._has_price[i] = True
+        self._price_version += 1
+    
+    def _valuation(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray,
+                                  np.ndarray, np.ndarray]:
+        """按当前价格估值，返回 (数量, 均价, 现价, 投入, 市值) 数组"""
+        self._compact()
+        n = len(self._symbols)
+        qty = self._qty[:n]
+        avg = self._avg[:n]
+        prices = np.where(self._has_price[:n], self._price_vec[:n], avg)
+        return qty, avg, prices, qty * avg, qty * prices
+    
+    @staticmethod
+    def _totals(invested: np.ndarray, current: np.ndarray) -> Dict[str, float]:
+        """由投入与市值数组汇总出四个总计指标"""
+        total_invested = float(invested.sum())
+        total_current = float(current.sum())
         total_pnl = total_current - total_invested
         total_pnl_pct = ((total_pnl / total_invested) * 100) if total_invested else 0
-        
         return {
             'total_invested': total_invested,
             'total_current_value': total_current,
-            'total_pnl': total_pnl, 'total_pnl_pct': total_pnl_pct,
-            'assets': assets_detail, 'asset_count': len(self.assets)
+            'total_pnl': total_pnl, 'total_pnl_pct': total_pnl_pct
         }
     
-    def export_to_csv(self, filename: str = 'portfolio.csv'):
-        """导出到CSV"""
-        summary = self.get_portfolio_summary()
+    def get_totals(self) -> Dict[str, float]:
+        """
+        获取投资组合总计 (不生成逐个资产的明细)
+        
+        Returns:
+            {'total_invested', 'total_current_value', 'total_pnl', 'total_pnl_pct'}
+        """
+        cached, version = self._summary_cache
+        if version == (self._version, self._price_version):
+            return {key: cached[key] for key in
+                    ('total_invested', 'total_current_value', 'total_pnl', 'total_pnl_pct')}
+        
+        _, _, _, invested, current = self._valuation()
+        return self._totals(invested, current)
+    
+    def get_portfolio_summary(self) -> Dict:
+        """
+        获取投资组合汇总
+        
+        持仓与行情均未变动时复用上次的计算结果；每次返回的都是副本，调用方可自由修改
+        """
+        cached, version = self._summary_cache
+        if version == (self._version, self._price_version):
+            return self._copy_summary(cached)
+        
+        qty, avg, prices, invested, current = self._valuation()
+        pnl = current - invested
+        pnl_pct = np.divide(pnl, invested, out=np.zeros(len(pnl)), where=invested > 0) * 100
+        
+        assets_detail = [
+            {
+                'symbol': symbol, 'name': name,
+                'quantity': q, 'avg_price': a, 'current_price': p,
+                'invested': inv, 'current_value': cur,
+                'pnl': gain, 'pnl_pct': gain_pct
+            }
+            for symbol, name, q, a, p, inv, cur, gain, gain_pct in zip(
+                self._symbols, self._names, qty.tolist(), avg.tolist(),
+                prices.tolist(), invested.tolist(), current.tolist(),
+                pnl.tolist(), pnl_pct.tolist())
+        ]
+        
+        summary = self._totals(invested, current)
+        summary['assets'] = assets_detail
+        summary['asset_count'] = len(assets_detail)
+        self._summary_cache = (summary, (self._version, self._price_version))
+        return self._copy_summary(summary)
+    
+    @staticmethod
+    def _copy_summary(summary: Dict) -> Dict:
+        """复制汇总及其中逐个资产的明细，使缓存不受调用方修改影响"""
+        return {**summary, 'assets': [dict(a) for a in summary['assets']]}
+    
+    def export_to_csv(self, filename: str = 'portfolio.csv',
+                      summary: Optional[Dict] = None):
+        """
+        导出到CSV
+        
+        Args:
+            filename: 导出路径
+            summary: 已计算好的汇总 (get_portfolio_summary 的结果)，不传则重新计算
+        """
+        if summary is None:
+            summary = self.get_portfolio_summary()
+        rows = [['Symbol', 'Name', 'Quantity', 'Avg Buy Price', 
+                 'Current Price', 'Invested', 'Current Value', 'P&L', 'P&L%']]
+        rows.extend([
+            a['symbol'], a['name'], f"{a['quantity']:.4f}",
+            f"${a['avg_price']:,.2f}", f"${a['current_price']:,.2f}",
+            f"${a['invested']:,.2f}", f"${a['current_value']:,.2f}",
+            f"${a['pnl']:,.2f}", f"{a['pnl_pct']:+.2f}%"
+        ] for a in summary['assets'])
+        rows.append([])
+        rows.append(['TOTAL', '', '', '', '', 
+                     f"${summary['total_invested']:,.2f}",
+                     f"${summary['total_current_value']:,.2f}",
+                     f"${summary['total_pnl']:,.2f}",
+                     f"{summary['total_pnl_pct']:+.2f}%"])
+        
         with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Symbol', 'Name', 'Quantity', 'Avg Buy Price', 
-                           'Current Price', 'Invested', 'Current Value', 'P&L', 'P&L%'])
-            for asset in summary['assets']:
-                writer.writerow([
-                    asset['symbol'], asset['name'], f"{asset['quantity']:.4f}",
-                    f"${asset['avg_price']:,.2f}", f"${asset['current_price']:,.2f}",
-                    f"${asset['invested']:,.2f}", f"${asset['current_value']:,.2f}",
-                    f"${asset['pnl']:,.2f}", f"{asset['pnl_pct']:+.2f}%"
-                ])
-            writer.writerow([])
-            writer.writerow(['TOTAL', '', '', '', '', 
-                           f"${summary['total_invested']:,.2f}",
-                           f"${summary['total_current_value']:,.2f}",
-                           f"${summary['total_pnl']:,.2f}",
-                           f"{summary['total_pnl_pct']:+.2f}%"])
+            csv.writer(f).writerows(rows)
     
     def save_to_json(self, filename: str = 'portfolio.json'):
         """保存到JSON"""
+        self._compact()
+        n = len(self._symbols)
         data = {
-            'assets': [asdict(a) for a in self.assets.values()],
+            'assets': [
+                {'symbol': symbol, 'name': name, 'quantity': q, 'avg_buy_price': a}
+                for symbol, name, q, a in zip(self._symbols, self._names,
+                                              self._qty[:n].tolist(), self._avg[:n].tolist())
+            ],
             'transactions': self.transactions,
             'saved_at': datetime.now().isoformat()
         }
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 |
+                                     orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
     
     def load_from_json(self, filename: str = 'portfolio.json'):
         """从JSON加载"""
-        with open(filename, 'r') as f:
-            data = json.load(f)
-        self.assets = {a['symbol']: Asset(**a) for a in data['assets']}
+        if orjson is not None:
+            with open(filename, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(filename, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        self._reset_holdings()
+        # 保存的代码均已是大写，无需再次规范化；
+        # 代码重复时与按代码建字典一致：保留首次出现的位置，取最后一条的值
+        for a in data['assets']:
+            i = self._idx.get(a['symbol'])
+            if i is None:
+                self._append_holding(a['symbol'], a['name'], a['quantity'],
+                                     a['avg_buy_price'])
+            else:
+                self._names[i] = a['name']
+                self._qty[i] = a['quantity']
+                self._avg[i] = a['avg_buy_price']
         self.transactions = data.get('transactions', [])
+        self._version += 1
 
 
 def print_portfolio_table(summary: Dict):
@@ -196,8 +424,8 @@ if __name__ == "__main__":
     tracker.add_asset('SOL', 'Solana', 25.0, 120)
     tracker.add_asset('ADA', 'Cardano', 5000.0, 0.75)
     
-    # 获取汇总
-    summary = tracker.get_portfolio_summary()
+    # 获取总计
+    totals = tracker.get_totals()
     
     # 打印报告
     print("\n" + "💰" * 20)
@@ -205,17 +433,18 @@ if __name__ == "__main__":
     print("\n" + "💰" * 20)
     
     print(f"\n📊 投资概览:")
-    print(f"   总投资:    ${summary['total_invested']:,.2f}")
-    print(f"   当前价值:  ${summary['total_current_value']:,.2f}")
+    print(f"   总投资:    ${totals['total_invested']:,.2f}")
+    print(f"   当前价值:  ${totals['total_current_value']:,.2f}")
     
-    pnl_emoji = "🟢" if summary['total_pnl'] >= 0 else "🔴"
-    print(f"   总盈亏:    {pnl_emoji} ${summary['total_pnl']:,.2f} ({summary['total_pnl_pct']:+.2f}%)")
+    pnl_emoji = "🟢" if totals['total_pnl'] >= 0 else "🔴"
+    print(f"   总盈亏:    {pnl_emoji} ${totals['total_pnl']:,.2f} ({totals['total_pnl_pct']:+.2f}%)")
     
     print(f"\n📈 持仓详情:")
+    summary = tracker.get_portfolio_summary()
     print_portfolio_table(summary)
     
     # 导出
-    tracker.export_to_csv()
+    tracker.export_to_csv(summary=summary)
     print(f"\n📁 已导出到 portfolio.csv")
     
     tracker.save_to_json()
@@ -0,0 +1,137 @@
+import pytest
+
+import portfolio_tracker
+from portfolio_tracker import Asset, CryptoPortfolioTracker
+
+
+def make_tracker():
+    tracker = CryptoPortfolioTracker()
+    tracker.add_asset('BTC', 'Bitcoin', 0.5, 45000, date='2026-01-01')
+    tracker.add_asset('ETH', 'Ethereum', 4.0, 2500, date='2026-01-01')
+    tracker.add_asset('SOL', 'Solana', 25.0, 120, date='2026-01-01')
+    return tracker
+
+
+def test_add_asset_merges_average_price():
+    tracker = make_tracker()
+    tracker.add_asset('btc', 'Bitcoin', 0.5, 55000, date='2026-01-02')
+
+    assert tracker.assets['BTC'] == Asset('BTC', 'Bitcoin', 1.0, 50000.0)
+    assert list(tracker.assets) == ['BTC', 'ETH', 'SOL']
+    assert tracker.transactions[-1] == {
+        'date': '2026-01-02', 'symbol': 'BTC', 'type': 'BUY',
+        'quantity': 0.5, 'price': 55000, 'total': 27500.0
+    }
+
+
+def test_remove_asset_partial_and_full():
+    tracker = make_tracker()
+
+    tracker.remove_asset('sol', 10)
+    assert tracker.assets['SOL'].quantity == 15.0
+    assert tracker.transactions[-1]['quantity'] == 10
+
+    tracker.remove_asset('SOL')
+    assert 'SOL' not in tracker.assets
+    assert tracker.transactions[-1]['quantity'] == 15.0
+
+    tracker.remove_asset('ETH', 100)
+    assert list(tracker.assets) == ['BTC']
+
+
+def test_remove_asset_missing_symbol_is_noop(capsys):
+    tracker = make_tracker()
+    tracker.remove_asset('DOGE')
+
+    assert '未持有 DOGE' in capsys.readouterr().out
+    assert len(tracker.assets) == 3
+    assert len(tracker.transactions) == 3
+
+
+def test_index_after_middle_delete_and_growth():
+    tracker = CryptoPortfolioTracker()
+    count = 2 * CryptoPortfolioTracker._INITIAL_CAPACITY + 5
+    for k in range(count):
+        tracker.add_asset(f'C{k}', f'Coin {k}', 1.0, k + 1.0)
+    for k in range(1, count, 3):
+        tracker.remove_asset(f'C{k}')
+    tracker.add_asset('C1', 'Coin 1 again', 2.0, 7.0)
+    tracker.add_asset('C0', 'Coin 0', 1.0, 3.0)
+
+    expected = [f'C{k}' for k in range(count) if k % 3 != 1] + ['C1']
+    summary = tracker.get_portfolio_summary()
+    assert [a['symbol'] for a in summary['assets']] == expected
+    assert tracker._idx == {symbol: i for i, symbol in enumerate(expected)}
+    assert tracker.assets['C0'] == Asset('C0', 'Coin 0', 2.0, 2.0)
+    assert tracker.assets['C1'] == Asset('C1', 'Coin 1 again', 2.0, 7.0)
+    assert tracker.assets[f'C{count - 1}'].avg_buy_price == count
+
+
+def test_summary_cache_returns_copies():
+    tracker = make_tracker()
+    first = tracker.get_portfolio_summary()
+    first['total_pnl'] = None
+    first['assets'][0]['pnl'] = None
+    first['assets'].clear()
+
+    second = tracker.get_portfolio_summary()
+    assert second['total_pnl'] is not None
+    assert second['assets'][0]['pnl'] is not None
+    assert second['asset_count'] == len(second['assets']) == 3
+
+
+def test_update_prices_falls_back_to_average_price():
+    tracker = make_tracker()
+    tracker.add_asset('NEW', 'Unlisted', 10.0, 2.0)
+    assets = tracker.assets
+    tracker.get_portfolio_summary()
+
+    tracker.update_prices({'btc': 100000.0})
+    by_symbol = {a['symbol']: a for a in tracker.get_portfolio_summary()['assets']}
+    assert by_symbol['BTC']['current_price'] == 100000.0
+    assert by_symbol['ETH']['current_price'] == portfolio_tracker.MOCK_PRICES['ETH']
+    assert by_symbol['NEW']['current_price'] == 2.0
+    assert by_symbol['NEW']['pnl'] == 0.0
+    assert tracker.get_totals()['total_current_value'] == pytest.approx(
+        sum(a['current_value'] for a in by_symbol.values()))
+    # 行情变动不影响持仓视图
+    assert tracker.assets is assets
+
+    tracker.update_prices({'NEW': 3.0})
+    assert tracker.get_portfolio_summary()['assets'][-1]['current_price'] == 3.0
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_json_round_trip(tmp_path, monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(portfolio_tracker, 'orjson', None)
+    tracker = make_tracker()
+    tracker.add_asset('ADA', '卡尔达诺', 5000.0, 0.75, date='2026-01-01')
+    tracker.remove_asset('ETH')
+    path = tmp_path / 'portfolio.json'
+    tracker.save_to_json(str(path))
+
+    loaded = CryptoPortfolioTracker()
+    loaded.load_from_json(str(path))
+    assert dict(loaded.assets) == dict(tracker.assets)
+    assert list(loaded.assets) == ['BTC', 'SOL', 'ADA']
+    assert loaded.transactions == tracker.transactions
+    assert loaded.get_portfolio_summary() == tracker.get_portfolio_summary()
+
+
+def test_load_from_json_merges_duplicate_symbols(tmp_path):
+    path = tmp_path / 'portfolio.json'
+    path.write_text(
+        '{"assets": ['
+        '{"symbol": "BTC", "name": "old", "quantity": 1, "avg_buy_price": 10},'
+        '{"symbol": "ETH", "name": "Ethereum", "quantity": 2, "avg_buy_price": 3},'
+        '{"symbol": "BTC", "name": "Bitcoin", "quantity": 5, "avg_buy_price": 20}'
+        ']}', encoding='utf-8')
+
+    tracker = CryptoPortfolioTracker()
+    tracker.load_from_json(str(path))
+    assert list(tracker.assets) == ['BTC', 'ETH']
+    assert tracker.assets['BTC'] == Asset('BTC', 'Bitcoin', 5.0, 20.0)
+    assert tracker.get_portfolio_summary()['asset_count'] == 2
@@ -5,12 +5,139 @@ Crypto Sentiment Tracker v1.0
 一个原创的、可执行的金融市场情绪分析框架
 """
 
-import pandas as pd
+import math
 import numpy as np
 from datetime import datetime, timedelta
-import requests
 from typing import Dict, List, Tuple, Optional
+import bisect
 import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，缺失时使用标准库 json
+    orjson = None
+
+
+# 日波动率年化系数
+SQRT_365 = math.sqrt(365)
+
+# API响应缓存有效期 (秒)
+CACHE_TTL = 600
+
+# {(coin_id, days): (获取时刻, 价格列表)}
+_PRICE_CACHE: Dict[Tuple[str, int], Tuple[float, List[float]]] = {}
+
+# (获取时刻, 指数字典)
+_FEAR_GREED_CACHE: Optional[Tuple[float, Dict]] = None
+
+# 复用HTTPS连接 (keep-alive)，首次请求时才创建
+_SESSION = None
+
+
+def _get_session():
+    """
+    获取共享的 requests.Session (失败时自动重试)
+    
+    requests 在此处延迟导入，只使用评分功能时无需承担其导入开销
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        session = requests.Session()
+        session.headers.update({'User-Agent': 'crypto-sentiment-tracker/1.0'})
+        session.mount('https://', HTTPAdapter(
+            pool_connections=4, pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=[429, 500, 502, 503, 504])
+        ))
+        _SESSION = session
+    return _SESSION
+
+
+def _growth_rate(series: List[float]) -> float:
+    """周环比变化率，数据不足或上周为0时返回0"""
+    if len(series) < 2 or series[-2] == 0:
+        return 0
+    return (series[-1] - series[-2]) / series[-2]
+
+
+def _compile_wordlist(words: Tuple[str, ...]) -> re.Pattern:
+    """把词库编译为单个整词匹配的正则 (长词优先，避免被短词截断)"""
+    alternation = '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+    return re.compile(r'\b(?:' + alternation + r')\b', re.IGNORECASE)
+
+
+# 正面词库和负面词库基于加密货币社区常用语，模块加载时编译一次
+_POSITIVE_WORDS = (
+    'moon', 'bull', 'bullish', 'breakout', 'accumulate', 'hodl', 
+    'diamond hands', 'pump', 'ATH', 'all time high', 'buy the dip',
+    'generational wealth', 'rocket', 'lambo', 'wagmi', 'gm'
+)
+_NEGATIVE_WORDS = (
+    'crash', 'bear', 'bearish', 'dump', 'panic', 'sell', 'exit',
+    'rug', 'scam', 'dead', 'bottom', 'capitulation', 'paper hands',
+    'ngmi', 'rekt', 'liquidated'
+)
+_POSITIVE_RE = _compile_wordlist(_POSITIVE_WORDS)
+_NEGATIVE_RE = _compile_wordlist(_NEGATIVE_WORDS)
+
+
+class _SentimentLevels(dict):
+    """
+    情绪等级字典 {(下限, 上限): 描述}
+    
+    按下限排序的 bisect 查找表缓存在字典上，任何写操作都会使其失效，
+    原地修改后下次分类时自动重建
+    """
+    
+    _table: Optional[Tuple[List[float], List[float], List[str]]] = None
+    
+    def lookup_table(self) -> Tuple[List[float], List[float], List[str]]:
+        """返回 (下限列表, 上限列表, 描述列表)"""
+        if self._table is None:
+            ordered = sorted(self.items())
+            self._table = ([low for (low, _), _ in ordered],
+                           [high for (_, high), _ in ordered],
+                           [desc for _, desc in ordered])
+        return self._table
+    
+    def __setitem__(self, key, value):
+        self._table = None
+        super().__setitem__(key, value)
+    
+    def __delitem__(self, key):
+        self._table = None
+        super().__delitem__(key)
+    
+    def __ior__(self, other):
+        self._table = None
+        return super().__ior__(other)
+    
+    def update(self, *args, **kwargs):
+        self._table = None
+        super().update(*args, **kwargs)
+    
+    def setdefault(self, key, default=None):
+        self._table = None
+        return super().setdefault(key, default)
+    
+    def pop(self, *args):
+        self._table = None
+        return super().pop(*args)
+    
+    def popitem(self):
+        self._table = None
+        return super().popitem()
+    
+    def clear(self):
+        self._table = None
+        super().clear()
 
 
 class CryptoSentimentTracker:
@@ -23,6 +150,37 @@ class CryptoSentimentTracker:
         print(f"当前情绪: {sentiment['overall']}")
     """
     
+    # 示例数据 (不传数据时使用，实际使用时应接入真实API)
+    _SAMPLE_DATA = {
+        'social': {
+            'positive_mentions': 12500,
+            'negative_mentions': 8300,
+            'total_mentions': 45000
+        },
+        'search': {
+            'buy_bitcoin': [45, 52, 48, 61, 58],
+            'crypto_crash': [30, 35, 42, 38, 33],
+            'altcoin_season': [25, 28, 35, 45, 52]
+        },
+        'onchain': {
+            'exchange_netflow': -2500,  # 净流出
+            'lth_supply_change': 0.8,   # 长期持有者增持0.8%
+            'sopr': 1.02                # 小幅盈利
+        },
+        'price_history': [42000, 43500, 42800, 45100, 46700, 
+                        45800, 47200, 48900, 47600, 49500] * 3
+    }
+    
+    # 交易信号分段阈值及对应文案 (bisect 查表)
+    _SIGNAL_THRESH = [25, 40, 60, 80]
+    _SIGNAL_LABELS = [
+        "🔴 极度恐惧 - 可能是买入机会",
+        "🟠 恐惧 - 考虑分批建仓",
+        "🟡 中性 - 观望或小额参与",
+        "🟢 贪婪 - 考虑获利了结",
+        "🔵 极度贪婪 - 警惕回调风险"
+    ]
+    
     def __init__(self):
         self.weights = {
             'social': 0.30,
@@ -38,6 +196,23 @@ class CryptoSentimentTracker:
             (80, 100): "极度贪婪 (Extreme Greed)"
         }
     
+    @property
+    def sentiment_levels(self) -> Dict[Tuple[float, float], str]:
+        """情绪等级区间 {(下限, 上限): 描述}，左闭右开；可整体替换或原地修改"""
+        return self._sentiment_levels
+    
+    @sentiment_levels.setter
+    def sentiment_levels(self, levels: Dict[Tuple[float, float], str]) -> None:
+        self._sentiment_levels = _SentimentLevels(levels)
+    
+    def _classify_sentiment(self, composite: float) -> str:
+        """将综合得分映射到情绪等级描述，不落在任何区间时返回 '未知'"""
+        lows, highs, labels = self._sentiment_levels.lookup_table()
+        i = bisect.bisect_right(lows, composite) - 1
+        if i >= 0 and composite < highs[i]:
+            return labels[i]
+        return "未知"
+    
     # ==================== 1. 社交媒体热度 ====================
     
     def calculate_social_heat(self, mentions_data: Dict) -> float:
@@ -55,40 +230,16 @@ class CryptoSentimentTracker:
         negative = mentions_data.get('negative_mentions', 0)
         total = mentions_data.get('total_mentions', 1)
         
-        # 情绪净值得分 (-1 到 1)
-        net_sentiment = (positive - negative) / total
-        
-        # 热度因子 (总提及量的对数缩放)
-        volume_factor = min(np.log10(total + 1) / 6, 1.0)
-        
-        # 综合得分映射到 0-100
-        raw_score = (net_sentiment + 1) / 2  # 映射到 0-1
-        heat_score = raw_score * 50 + volume_factor * 50
-        
-        return round(min(max(heat_score, 0), 100), 2)
+        return _social_heat(float(positive), float(negative), float(total))
     
     def analyze_twitter_sentiment(self, tweets: List[str]) -> Dict:
         """
         简单的Twitter情绪分析
         
-        正面词库和负面词库基于加密货币社区常用语
+        按整词匹配统计正面/负面词命中次数 (忽略大小写)
         """
-        positive_words = [
-            'moon', 'bull', 'bullish', 'breakout', 'accumulate', 'hodl', 
-            'diamond hands', 'pump', ' ATH', 'all time high', 'buy the dip',
-            'generational wealth', 'rocket', 'lambo', 'wagmi', 'gm'
-        ]
-        
-        negative_words = [
-            'crash', 'bear', 'bearish', 'dump', 'panic', 'sell', 'exit',
-            'rug', 'scam', 'dead', 'bottom', 'capitulation', 'paper hands',
-            'ngmi', 'rekt', 'liquidated'
-        ]
-        
-        positive_count = sum(1 for tweet in tweets 
-                           for word in positive_words if word in tweet.lower())
-        negative_count = sum(1 for tweet in tweets 
-                           for word in negative_words if word in tweet.lower())
+        positive_count = sum(len(_POSITIVE_RE.findall(tweet)) for tweet in tweets)
+        negative_count = sum(len(_NEGATIVE_RE.findall(tweet)) for tweet in tweets)
         
         return {
             'positive_mentions': positive_count,
@@ -110,28 +261,12 @@ class CryptoSentimentTracker:
             }
         """
         # 计算各关键词的周环比变化
-        def growth_rate(series):
-            if len(series) < 2 or series[-2] == 0:
-                return 0
-            return (series[-1] - series[-2]) / series[-2]
-        
-        buy_growth = growth_rate(trend_data.get('buy_bitcoin', [0, 0]))
-        crash_growth = growth_rate(trend_data.get('crypto_crash', [0, 0]))
-        alt_growth = growth_rate(trend_data.get('altcoin_season', [0, 0]))
-        
-        # 买入兴趣上升 = 看涨信号
-        # 崩盘搜索上升 = 看跌信号
-        # 山寨季搜索上升 = 风险偏好高
-        
-        sentiment_score = (
-            buy_growth * 40 +           # 买入兴趣权重
-            (1 - crash_growth) * 30 +   # 崩盘恐惧反向权重
-            alt_growth * 30             # 山寨季热度
-        )
+        buy_growth = _growth_rate(trend_data.get('buy_bitcoin', [0, 0]))
+        crash_growth = _growth_rate(trend_data.get('crypto_crash', [0, 0]))
+        alt_growth = _growth_rate(trend_data.get('altcoin_season', [0, 0]))
         
-        # 映射到 0-100
-        normalized = (sentiment_score + 1) * 50
-        return round(min(max(normalized, 0), 100), 2)
+        return _search_momentum(float(buy_growth), float(crash_growth),
+                                float(alt_growth))
     
     # ==================== 3. 链上数据分析 ====================
     
@@ -146,38 +281,11 @@ class CryptoSentimentTracker:
                 'sopr': float               # 花费输出利润率 (>1盈利，<1亏损)
             }
         """
-        signals = []
-        
-        # 信号1: 交易所净流出 = 持有者转移去冷钱包 = 看涨
         netflow = chain_data.get('exchange_netflow', 0)
-        if netflow < -1000:  # 大额流出
-            signals.append(80)
-        elif netflow < 0:
-            signals.append(60)
-        else:
-            signals.append(40)
-        
-        # 信号2: 长期持有者增持 = 看涨
         lth_change = chain_data.get('lth_supply_change', 0)
-        if lth_change > 1:
-            signals.append(75)
-        elif lth_change > 0:
-            signals.append(60)
-        else:
-            signals.append(45)
-        
-        # 信号3: SOPR指标
         sopr = chain_data.get('sopr', 1.0)
-        if sopr > 1.05:  # 大量获利了结，可能顶部
-            signals.append(40)
-        elif sopr > 1.0:  # 健康获利
-            signals.append(65)
-        elif sopr < 0.95:  # 亏损抛售，可能底部
-            signals.append(70)
-        else:
-            signals.append(50)
         
-        return round(np.mean(signals), 2)
+        return _onchain_signals(float(netflow), float(lth_change), float(sopr))
     
     # ==================== 4. 波动率分析 ====================
     
@@ -191,25 +299,12 @@ class CryptoSentimentTracker:
             return 50
         
         # 计算30日波动率
-        returns = pd.Series(price_data).pct_change().dropna()
-        current_vol = returns.tail(7).std() * np.sqrt(365)  # 年化
-        avg_vol = returns.std() * np.sqrt(365)
-        
-        # 波动率偏离度
-        vol_deviation = (current_vol - avg_vol) / avg_vol
-        
-        # 高波动率 = 恐惧 (低分)
-        # 极低波动率 = 压抑后的爆发可能 (中高分)
-        if vol_deviation > 0.5:  # 波动率激增
-            score = 30
-        elif vol_deviation > 0.2:
-            score = 45
-        elif vol_deviation < -0.3:  # 波动率极低
-            score = 65  # 变盘前兆
-        else:
-            score = 55
+        prices = np.asarray(price_data, dtype=np.float64)
+        returns = np.diff(prices) / prices[:-1]
+        current_vol = returns[-7:].std(ddof=1) * SQRT_365  # 年化
+        avg_vol = returns.std(ddof=1) * SQRT_365
         
-        return score
+        return _volatility_score(float(current_vol), float(avg_vol))
     
     # ==================== 综合计算 ====================
     
@@ -230,25 +325,7 @@ class CryptoSentimentTracker:
             }
         """
         # 使用示例数据（实际使用时应接入真实API）
-        sample_data = data or {
-            'social': {
-                'positive_mentions': 12500,
-                'negative_mentions': 8300,
-                'total_mentions': 45000
-            },
-            'search': {
-                'buy_bitcoin': [45, 52, 48, 61, 58],
-                'crypto_crash': [30, 35, 42, 38, 33],
-                'altcoin_season': [25, 28, 35, 45, 52]
-            },
-            'onchain': {
-                'exchange_netflow': -2500,  # 净流出
-                'lth_supply_change': 0.8,   # 长期持有者增持0.8%
-                'sopr': 1.02                # 小幅盈利
-            },
-            'price_history': [42000, 43500, 42800, 45100, 46700, 
-                            45800, 47200, 48900, 47600, 49500] * 3
-        }
+        sample_data = data or self._SAMPLE_DATA
         
         # 计算各分项
         social_score = self.calculate_social_heat(sample_data['social'])
@@ -265,23 +342,10 @@ class CryptoSentimentTracker:
         )
         
         # 确定情绪等级
-        sentiment_desc = "未知"
-        for (low, high), desc in self.sentiment_levels.items():
-            if low <= composite < high:
-                sentiment_desc = desc
-                break
+        sentiment_desc = self._classify_sentiment(composite)
         
         # 生成交易信号
-        if composite < 25:
-            signal = "🔴 极度恐惧 - 可能是买入机会"
-        elif composite < 40:
-            signal = "🟠 恐惧 - 考虑分批建仓"
-        elif composite < 60:
-            signal = "🟡 中性 - 观望或小额参与"
-        elif composite < 80:
-            signal = "🟢 贪婪 - 考虑获利了结"
-        else:
-            signal = "🔵 极度贪婪 - 警惕回调风险"
+        signal = self._SIGNAL_LABELS[bisect.bisect_right(self._SIGNAL_THRESH, composite)]
         
         return {
             'overall': sentiment_desc,
@@ -296,6 +360,71 @@ class CryptoSentimentTracker:
             'timestamp': datetime.now().isoformat()
         }
     
+    def score_batch(self, scenarios: List[Dict]) -> np.ndarray:
+        """
+        批量计算多组数据的综合情绪得分
+        
+        安装 numba 时把各组数据堆叠为二维数组，由编译后的 _score_batch 沿批次维度
+        并行计算；total_mentions 为0或价格非有限正数的组改走逐组计算，结果与
+        get_comprehensive_sentiment 一致 (包括抛出的异常)。未安装 numba 时用
+        多进程逐组调用 get_comprehensive_sentiment。
+        
+        Args:
+            scenarios: 数据字典列表，格式同 get_comprehensive_sentiment 的 data
+        
+        Returns:
+            (N,) 综合得分数组
+        """
+        if not scenarios:
+            return np.empty(0)
+        
+        # 与 get_comprehensive_sentiment 相同：空数据使用示例数据
+        scenarios = [scenario or self._SAMPLE_DATA for scenario in scenarios]
+        
+        score_batch_nb = _load_batch_kernel()
+        if score_batch_nb is None:
+            with ProcessPoolExecutor() as executor:
+                results = executor.map(self.get_comprehensive_sentiment, scenarios)
+                return np.array([r['score'] for r in results], dtype=np.float64)
+        
+        n = len(scenarios)
+        social_arr = np.empty((n, 3))
+        search_arr = np.empty((n, 3))
+        onchain_arr = np.empty((n, 3))
+        price_lengths = np.array([len(s['price_history']) for s in scenarios], dtype=np.int64)
+        price_windows = np.ones((n, max(price_lengths.max(), 1)))
+        
+        for i, scenario in enumerate(scenarios):
+            social = scenario['social']
+            social_arr[i] = (social.get('positive_mentions', 0),
+                             social.get('negative_mentions', 0),
+                             social.get('total_mentions', 1))
+            search = scenario['search']
+            search_arr[i] = (_growth_rate(search.get('buy_bitcoin', [0, 0])),
+                             _growth_rate(search.get('crypto_crash', [0, 0])),
+                             _growth_rate(search.get('altcoin_season', [0, 0])))
+            onchain = scenario['onchain']
+            onchain_arr[i] = (onchain.get('exchange_netflow', 0),
+                              onchain.get('lth_supply_change', 0),
+                              onchain.get('sopr', 1.0))
+            price_windows[i, :price_lengths[i]] = scenario['price_history']
+        
+        # 内核不做除零与非有限值判断，不合格的组交给逐组计算
+        valid = ((social_arr[:, 2] != 0) &
+                 np.all(np.isfinite(price_windows) & (price_windows > 0), axis=1))
+        
+        scores = np.empty(n)
+        if valid.any():
+            weights = np.array([self.weights['social'], self.weights['search'],
+                                self.weights['onchain'], self.weights['volatility']])
+            composite = score_batch_nb(social_arr[valid], search_arr[valid],
+                                       onchain_arr[valid], price_windows[valid],
+                                       price_lengths[valid], weights)
+            scores[valid] = [round(c, 2) for c in composite.tolist()]
+        for i in np.flatnonzero(~valid):
+            scores[i] = self.get_comprehensive_sentiment(scenarios[i])['score']
+        return scores
+    
     def export_report(self, output_path: str = None) -> str:
         """
         生成并导出情绪分析报告
@@ -312,12 +441,201 @@ class CryptoSentimentTracker:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_path = f"sentiment_report_{timestamp}.json"
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 |
+                                     orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
         
         return output_path
 
 
+# ==================== 评分内核 ====================
+#
+# 各分项评分规则的唯一实现，均为普通Python函数：CryptoSentimentTracker 的分项
+# 方法直接调用。score_batch 首次调用时由 _load_batch_kernel 导入 numba，把这些
+# 函数连同 _score_batch 编译为 *_nb 内核，沿批次维度并行计算；批量路径的输入须先
+# 经 score_batch 校验 (total_mentions 非0，价格有限且 > 0)，以免在热循环中加入
+# 除零判断。
+
+# 链上信号分段阈值及对应得分 (np.searchsorted 查表)
+# 交易所净流量: < -1000 大额流出 80, < 0 流出 60, 其余 40
+_NETFLOW_THRESH = np.array([-1000.0, 0.0])
+_NETFLOW_SCORE = np.array([80.0, 60.0, 40.0])
+# 长期持有者持仓变化: <= 0 为 45, (0, 1] 为 60, > 1 为 75
+_LTH_THRESH = np.array([0.0, 1.0])
+_LTH_SCORE = np.array([45.0, 60.0, 75.0])
+# SOPR: < 0.95 亏损抛售可能底部 70, [0.95, 1.0] 50,
+#       (1.0, 1.05] 健康获利 65, > 1.05 大量获利了结可能顶部 40
+_SOPR_THRESH = np.array([np.nextafter(0.95, -np.inf), 1.0, 1.05])
+_SOPR_SCORE = np.array([70.0, 50.0, 65.0, 40.0])
+
+
+def _social_heat(positive, negative, total):
+    """社交媒体热度评分 (calculate_social_heat)"""
+    # 情绪净值得分 (-1 到 1)
+    net_sentiment = (positive - negative) / total
+    
+    # 热度因子 (总提及量的对数缩放)
+    volume_factor = min(float(np.log10(total + 1.0)) / 6.0, 1.0)
+    
+    # 综合得分映射到 0-100
+    raw_score = (net_sentiment + 1.0) / 2.0  # 映射到 0-1
+    heat_score = raw_score * 50.0 + volume_factor * 50.0
+    
+    return round(min(max(heat_score, 0.0), 100.0), 2)
+
+
+def _search_momentum(buy_growth, crash_growth, alt_growth):
+    """搜索趋势动量评分 (calculate_search_momentum)，输入为周环比增长率"""
+    # 买入兴趣上升 = 看涨信号
+    # 崩盘搜索上升 = 看跌信号
+    # 山寨季搜索上升 = 风险偏好高
+    sentiment_score = (
+        buy_growth * 40.0 +           # 买入兴趣权重
+        (1.0 - crash_growth) * 30.0 + # 崩盘恐惧反向权重
+        alt_growth * 30.0             # 山寨季热度
+    )
+    
+    # 映射到 0-100
+    normalized = (sentiment_score + 1.0) * 50.0
+    return round(min(max(normalized, 0.0), 100.0), 2)
+
+
+def _onchain_signals(netflow, lth_change, sopr):
+    """链上信号评分 (analyze_onchain_signals)"""
+    # 信号1: 交易所净流出 = 持有者转移去冷钱包 = 看涨
+    netflow_score = float(_NETFLOW_SCORE[np.searchsorted(_NETFLOW_THRESH, netflow, side='right')])
+    # 信号2: 长期持有者增持 = 看涨
+    lth_score = float(_LTH_SCORE[np.searchsorted(_LTH_THRESH, lth_change, side='left')])
+    # 信号3: SOPR指标
+    sopr_score = float(_SOPR_SCORE[np.searchsorted(_SOPR_THRESH, sopr, side='left')])
+    
+    return round((netflow_score + lth_score + sopr_score) / 3.0, 2)
+
+
+def _volatility_score(current_vol, avg_vol):
+    """由近7日与全窗口的年化波动率给出逆向情绪分 (calculate_volatility_sentiment)"""
+    # 价格恒定时偏离度无定义，归入默认档
+    if avg_vol == 0.0:
+        return 55.0
+    
+    # 波动率偏离度
+    vol_deviation = (current_vol - avg_vol) / avg_vol
+    
+    # 高波动率 = 恐惧 (低分)
+    # 极低波动率 = 压抑后的爆发可能 (中高分)
+    if vol_deviation > 0.5:  # 波动率激增
+        return 30.0
+    elif vol_deviation > 0.2:
+        return 45.0
+    elif vol_deviation < -0.3:  # 波动率极低
+        return 65.0  # 变盘前兆
+    return 55.0
+
+
+def _volatility_window(prices):
+    """批量路径的波动率评分 (prices 为已校验的一维价格窗口，仅以 *_nb 形式调用)"""
+    n = prices.shape[0] - 1
+    if n < 29:
+        return 50.0
+    
+    # 样本标准差 (ddof=1)：全窗口与最近7日
+    total = 0.0
+    recent = 0.0
+    for j in range(n):
+        r = prices[j + 1] / prices[j] - 1.0
+        total += r
+        if j >= n - 7:
+            recent += r
+    mean_all = total / n
+    mean_recent = recent / 7.0
+    
+    sq_all = 0.0
+    sq_recent = 0.0
+    for j in range(n):
+        r = prices[j + 1] / prices[j] - 1.0
+        sq_all += (r - mean_all) ** 2
+        if j >= n - 7:
+            sq_recent += (r - mean_recent) ** 2
+    avg_vol = np.sqrt(sq_all / (n - 1)) * SQRT_365
+    current_vol = np.sqrt(sq_recent / 6.0) * SQRT_365
+    
+    return _volatility_score_nb(current_vol, avg_vol)
+
+
+def _score_batch(social_arr, search_arr, onchain_arr, price_windows,
+                 price_lengths, weights):
+    """
+    批量计算综合情绪得分 (仅以编译后的形式调用)
+    
+    Args:
+        social_arr: (N, 3) 正面提及/负面提及/总提及
+        search_arr: (N, 3) 买入/崩盘/山寨季搜索的周环比增长率
+        onchain_arr: (N, 3) 交易所净流量/长期持有者持仓变化/SOPR
+        price_windows: (N, T) 左对齐的价格窗口
+        price_lengths: (N,) 每个窗口的有效长度
+        weights: (4,) social/search/onchain/volatility 权重
+    
+    Returns:
+        (N,) 综合得分
+    """
+    n = social_arr.shape[0]
+    composite = np.empty(n, dtype=np.float64)
+    for i in prange(n):
+        social = _social_heat_nb(social_arr[i, 0], social_arr[i, 1], social_arr[i, 2])
+        search = _search_momentum_nb(search_arr[i, 0], search_arr[i, 1], search_arr[i, 2])
+        onchain = _onchain_signals_nb(onchain_arr[i, 0], onchain_arr[i, 1], onchain_arr[i, 2])
+        vol = _volatility_window_nb(price_windows[i, :price_lengths[i]])
+        composite[i] = (social * weights[0] + search * weights[1] +
+                        onchain * weights[2] + vol * weights[3])
+    return composite
+
+
+# 编译后的内核，由 _load_batch_kernel 首次调用时填充；_score_batch 等在编译时
+# 按名称解析下列全局变量，prange 此时也替换为 numba.prange
+_social_heat_nb = None
+_search_momentum_nb = None
+_onchain_signals_nb = None
+_volatility_score_nb = None
+_volatility_window_nb = None
+_score_batch_nb = None
+_batch_kernel_loaded = False
+prange = range
+
+
+def _load_batch_kernel():
+    """
+    导入 numba 并编译批量评分内核 (只在首次调用时进行)
+    
+    Returns:
+        编译后的 _score_batch，未安装 numba 时返回 None
+    """
+    global _social_heat_nb, _search_momentum_nb, _onchain_signals_nb
+    global _volatility_score_nb, _volatility_window_nb, _score_batch_nb
+    global _batch_kernel_loaded, prange
+    
+    if not _batch_kernel_loaded:
+        _batch_kernel_loaded = True
+        try:
+            import numba
+        except ImportError:  # numba 为可选依赖，缺失时 score_batch 改用多进程
+            return None
+        
+        jit = numba.njit(cache=True)
+        _social_heat_nb = jit(_social_heat)
+        _search_momentum_nb = jit(_search_momentum)
+        _onchain_signals_nb = jit(_onchain_signals)
+        _volatility_score_nb = jit(_volatility_score)
+        _volatility_window_nb = jit(_volatility_window)
+        prange = numba.prange
+        _score_batch_nb = numba.njit(cache=True, parallel=True)(_score_batch)
+    
+    return _score_batch_nb
+
+
 # ==================== 数据获取辅助函数 ====================
 
 def fetch_coingecko_price(coin_id: str = 'bitcoin', days: int = 30) -> List[float]:
@@ -329,16 +647,23 @@ def fetch_coingecko_price(coin_id: str = 'bitcoin', days: int = 30) -> List[floa
         days: 获取天数
     
     Returns:
-        价格列表
+        价格列表 (CACHE_TTL 秒内的重复调用直接返回缓存)
     """
+    key = (coin_id, days)
+    cached = _PRICE_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < CACHE_TTL:
+        return list(cached[1])
+    
     url = f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart"
     params = {'vs_currency': 'usd', 'days': days}
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = _get_session().get(url, params=params, timeout=10)
         data = response.json()
         prices = [p[1] for p in data.get('prices', [])]
-        return prices
+        if prices:
+            _PRICE_CACHE[key] = (time.monotonic(), prices)
+        return list(prices)
     except Exception as e:
         print(f"获取价格数据失败: {e}")
         return []
@@ -349,19 +674,25 @@ def fetch_fear_greed_index() -> Optional[Dict]:
     获取Alternative.me的恐惧贪婪指数作为对比参考
     
     Returns:
-        包含指数值和分类的字典
+        包含指数值和分类的字典 (CACHE_TTL 秒内的重复调用直接返回缓存)
     """
+    global _FEAR_GREED_CACHE
+    if _FEAR_GREED_CACHE and time.monotonic() - _FEAR_GREED_CACHE[0] < CACHE_TTL:
+        return dict(_FEAR_GREED_CACHE[1])
+    
     url = "https://api.alternative.me/fng/"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = _get_session().get(url, timeout=10)
         data = response.json()
         if data.get('data'):
-            return {
+            result = {
                 'value': int(data['data'][0]['value']),
                 'classification': data['data'][0]['value_classification'],
                 'timestamp': data['data'][0]['timestamp']
             }
+            _FEAR_GREED_CACHE = (time.monotonic(), result)
+            return dict(result)
     except Exception as e:
         print(f"获取恐惧贪婪指数失败: {e}")
     
@@ -0,0 +1,121 @@
+import math
+import random
+
+import pytest
+
+from sentiment_tracker import CryptoSentimentTracker
+
+
+def make_scenario(price_history=None, total_mentions=45000):
+    return {
+        'social': {
+            'positive_mentions': 12500,
+            'negative_mentions': 8300,
+            'total_mentions': total_mentions
+        },
+        'search': {
+            'buy_bitcoin': [45, 52, 48, 61, 58],
+            'crypto_crash': [30, 35, 42, 38, 33],
+            'altcoin_season': [25, 28, 35, 45, 52]
+        },
+        'onchain': {
+            'exchange_netflow': -2500,
+            'lth_supply_change': 0.8,
+            'sopr': 1.02
+        },
+        'price_history': price_history or [42000, 43500, 42800, 45100, 46700,
+                                           45800, 47200, 48900, 47600, 49500] * 3
+    }
+
+
+def random_scenario(rng):
+    return {
+        'social': {
+            'positive_mentions': rng.randint(0, 9000),
+            'negative_mentions': rng.randint(0, 9000),
+            'total_mentions': rng.randint(1, 30000)
+        },
+        'search': {
+            key: [rng.randint(0, 100) for _ in range(5)]
+            for key in ('buy_bitcoin', 'crypto_crash', 'altcoin_season')
+        },
+        'onchain': {
+            'exchange_netflow': rng.choice([-1000, 0, rng.uniform(-3000, 3000)]),
+            'lth_supply_change': rng.choice([0, 1, rng.uniform(-2, 2)]),
+            'sopr': rng.choice([0.95, 1.0, 1.05, rng.uniform(0.9, 1.1)])
+        },
+        'price_history': [rng.uniform(100, 200) for _ in range(rng.randint(10, 45))]
+    }
+
+
+def per_scenario_scores(tracker, scenarios):
+    return [tracker.get_comprehensive_sentiment(s)['score'] for s in scenarios]
+
+
+def test_score_batch_matches_per_scenario():
+    tracker = CryptoSentimentTracker()
+    rng = random.Random(0)
+    scenarios = [make_scenario()] + [random_scenario(rng) for _ in range(200)]
+    
+    assert tracker.score_batch(scenarios).tolist() == per_scenario_scores(tracker, scenarios)
+
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_score_batch_routes_invalid_prices_through_scalar_path():
+    tracker = CryptoSentimentTracker()
+    prices = make_scenario()['price_history']
+    with_nan = prices[:10] + [math.nan] + prices[11:]
+    with_inf = prices[:-1] + [math.inf]
+    with_zero = prices[:10] + [0] + prices[11:]
+    scenarios = [make_scenario(with_nan), make_scenario(with_inf),
+                 make_scenario(with_zero), make_scenario()]
+    
+    assert tracker.score_batch(scenarios).tolist() == per_scenario_scores(tracker, scenarios)
+
+
+def test_score_batch_zero_mentions_raises_like_per_scenario():
+    tracker = CryptoSentimentTracker()
+    scenarios = [make_scenario(), make_scenario(total_mentions=0)]
+    
+    with pytest.raises(ZeroDivisionError):
+        tracker.get_comprehensive_sentiment(scenarios[1])
+    with pytest.raises(ZeroDivisionError):
+        tracker.score_batch(scenarios)
+
+
+def test_score_batch_empty():
+    assert CryptoSentimentTracker().score_batch([]).shape == (0,)
+
+
+def test_score_batch_empty_scenario_uses_sample_data():
+    tracker = CryptoSentimentTracker()
+    scenarios = [{}, make_scenario()]
+    scores = tracker.score_batch(scenarios)
+    assert scores[0] == tracker.get_comprehensive_sentiment({})['score']
+    assert scores.tolist() == per_scenario_scores(tracker, scenarios)
+
+
+def test_sentiment_levels_in_place_edit_is_picked_up():
+    tracker = CryptoSentimentTracker()
+    assert tracker.get_comprehensive_sentiment()['overall'] == "贪婪 (Greed)"
+    
+    tracker.sentiment_levels[(60, 80)] = "CUSTOM GREED"
+    assert tracker.get_comprehensive_sentiment()['overall'] == "CUSTOM GREED"
+    
+    tracker.sentiment_levels = {(0, 50): "低", (50, 75): "高"}
+    assert tracker.get_comprehensive_sentiment()['overall'] == "高"
+    del tracker.sentiment_levels[(50, 75)]
+    assert tracker.get_comprehensive_sentiment()['overall'] == "未知"
+
+
+def test_sentiment_levels_dict_methods_invalidate_lookup():
+    tracker = CryptoSentimentTracker()
+    
+    tracker.sentiment_levels.update({(60, 80): "UPDATED"})
+    assert tracker.get_comprehensive_sentiment()['overall'] == "UPDATED"
+    tracker.sentiment_levels.pop((60, 80))
+    assert tracker.get_comprehensive_sentiment()['overall'] == "未知"
+    tracker.sentiment_levels.setdefault((60, 80), "DEFAULT")
+    assert tracker.get_comprehensive_sentiment()['overall'] == "DEFAULT"
+    tracker.sentiment_levels.clear()
+    assert tracker.get_comprehensive_sentiment()['overall'] == "未知"